@@ -1,111 +1,135 @@
 import os
 import sys
 import shutil
-import datetime
-import json
+import threading
+import time
+import uuid
 import gradio as gr
 
 # Ensure `src` is in Python's module search path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
 
-from markdown_pdf import MarkdownPdf, Section
 from gradio_pdf import PDF
 from resume_crew.crew import ResumeCrew
+from resume_crew.json_files import loads_json
 from crewai.knowledge.source.pdf_knowledge_source import PDFKnowledgeSource
+from resume_app_common import (
+    OUTPUT_CACHE_DIR,
+    convert_md_to_pdf,
+    model_choices,
+    output_cache_key,
+    restore_cached_outputs,
+    store_outputs_in_cache
+)
+
+# --- Pre-warm the PDF knowledge stack ---
+# The first PDFKnowledgeSource pays for importing pdfplumber/pdfminer and loading their
+# font and CMap tables. Parse the bundled sample resume in the background at startup so
+# the first Run doesn't.
+WARMUP_RESUME = "CV_Mohan.pdf"  # Resolved by CrewAI relative to knowledge/
+
+def _warm_up_pdf_knowledge():
+    try:
+        PDFKnowledgeSource(file_paths=[WARMUP_RESUME])
+    except Exception:
+        pass  # Warm-up is an optimization only
 
-# Set backend directories for Hugging Face Spaces
-UPLOAD_DIR = "/tmp/uploads"
-OUTPUT_DIR = "/tmp/output"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-def convert_md_to_pdf(md_path: str) -> str:
-    """
-    Convert a local .md file to .pdf using markdown-pdf.
-    Returns the resulting PDF file path, or an empty string if conversion fails.
-    """
-    if not os.path.isfile(md_path):
-        return ""
-    with open(md_path, "r", encoding="utf-8") as f:
-        md_content = f.read()
-    pdf_obj = MarkdownPdf(toc_level=2)
-    pdf_obj.add_section(Section(md_content))
-    
-    pdf_path = os.path.splitext(md_path)[0] + ".pdf"
-    pdf_obj.save(pdf_path)
-    return pdf_path if os.path.isfile(pdf_path) else ""
+threading.Thread(target=_warm_up_pdf_knowledge, daemon=True).start()
 
 def process_resume(openai_api_key, serper_api_key, model_choice, new_resume, company_name, job_url):
     """
     Processes the uploaded resume using ResumeCrew and converts the output Markdown files to PDFs.
     Handles errors gracefully and stops execution upon failure.
     """
+    run_dir = None
     try:
-        current_date = datetime.datetime.now().strftime("%Y%m%d")
+        current_date = time.strftime("%Y%m%d", time.localtime())
         
         # --- Ensure a resume file is uploaded ---
-        if new_resume is None or not (hasattr(new_resume, "name") and new_resume.name.strip() != ""):
+        if not new_resume or not new_resume.strip():
             return ("Error: Please upload a resume.", None, None, None, None, None, None)
         
-        # --- Set API keys ---
-        os.environ["OPENAI_API_KEY"] = openai_api_key or ""
-        os.environ["SERPER_API_KEY"] = serper_api_key or ""
+        # --- Ensure API keys are provided ---
+        # Keys are handed to this run's crew only, never written to os.environ: concurrent runs
+        # share the process, and a blank key must not fall back to someone else's
+        if not openai_api_key or not openai_api_key.strip() or not serper_api_key or not serper_api_key.strip():
+            return ("Error: Please enter both the OpenAI and Serper API keys.", None, None, None, None, None, None)
+
+        # Private per run, so concurrent runs don't overwrite each other's upload or outputs
+        run_id = uuid.uuid4().hex
 
         # --- Save uploaded file ---
         try:
-            if hasattr(new_resume, "read"):
-                original_filename = os.path.basename(new_resume.name)
-                file_data = new_resume.read()
-            else:
-                original_filename = os.path.basename(new_resume)
-                file_data = None
+            # Gradio hands over the path of its temp copy (type="filepath"); copy it
+            # in-kernel (sendfile/copy_file_range) without buffering the PDF in Python
+            original_filename = os.path.basename(new_resume)
 
             base_filename, ext = os.path.splitext(original_filename)
-            new_resume_filename = f"{base_filename}_{current_date}{ext}"
+            new_resume_filename = f"{base_filename}_{current_date}_{run_id}{ext}"
             physical_path = os.path.join("knowledge", new_resume_filename)
-            os.makedirs("knowledge", exist_ok=True)
-
-            if file_data is not None:
-                with open(physical_path, "wb") as f:
-                    f.write(file_data)
-            else:
-                shutil.copy(new_resume, physical_path)
+            shutil.copyfile(new_resume, physical_path)
         except Exception as e:
             return (f"Error saving the uploaded resume: {str(e)}", None, None, None, None, None, None)
 
-        # --- Initialize ResumeCrew ---
+        # --- Private working directory ---
+        # (kept relative: CrewAI strips the leading slash of absolute output_file paths)
+        run_dir = os.path.join("output", f"run_{run_id}")
+        os.makedirs(run_dir)
+
+        # --- Reuse the outputs of an identical earlier run ---
         try:
-            crew_instance = ResumeCrew(
-                model=model_choice,
-                openai_api_key=openai_api_key,
-                serper_api_key=serper_api_key,
-                resume_pdf_path=new_resume_filename
+            output_cache_dir = os.path.join(
+                OUTPUT_CACHE_DIR, output_cache_key(physical_path, company_name, job_url, model_choice)
             )
-        except Exception as e:
-            return (f"Error initializing ResumeCrew: {str(e)}", None, None, None, None, None, None)
+            cache_hit = restore_cached_outputs(output_cache_dir, run_dir)
+        except OSError:
+            output_cache_dir, cache_hit = None, False
 
-        # --- Run the resume processing ---
-        try:
-            crew_instance.crew().kickoff(inputs={'job_url': job_url, 'company_name': company_name})
-        except Exception as e:
-            return (f"Error during resume processing: {str(e)}", None, None, None, None, None, None)
+        if not cache_hit:
+            # --- Initialize ResumeCrew ---
+            try:
+                crew_instance = ResumeCrew(
+                    model=model_choice,
+                    openai_api_key=openai_api_key,
+                    serper_api_key=serper_api_key,
+                    resume_pdf_path=new_resume_filename,
+                    output_dir=run_dir
+                )
+            except Exception as e:
+                return (f"Error initializing ResumeCrew: {str(e)}", None, None, None, None, None, None)
+
+            # --- Run the resume processing ---
+            try:
+                crew_instance.crew().kickoff(inputs={'job_url': job_url, 'company_name': company_name})
+            except Exception as e:
+                return (f"Error during resume processing: {str(e)}", None, None, None, None, None, None)
+
+            if output_cache_dir is not None:
+                try:
+                    store_outputs_in_cache(output_cache_dir, run_dir)
+                except OSError:
+                    pass  # Caching is best-effort
 
         # --- Retrieve output files ---
         try:
-            job_analysis_path = os.path.join("output", "job_analysis.json")
-            with open(job_analysis_path, "r") as f:
-                job_data = json.load(f)
+            job_analysis_path = os.path.join(run_dir, "job_analysis.json")
+            with open(job_analysis_path, "rb") as f:
+                data = f.read()
+            job_data = loads_json(data)
             position_name = job_data.get("job_title", "position")
         except Exception:
             position_name = "position"
 
-        optimized_resume_path = os.path.join("output", "optimized_resume.md")
+        # The resume is read once here; the same text is reused for its PDF conversion
+        optimized_resume_path = os.path.join(run_dir, "optimized_resume.md")
+        optimized_resume_md = None
         candidate_name = "candidate"
         try:
-            with open(optimized_resume_path, "r") as f:
-                first_line = f.readline()
-                if first_line.startswith("#"):
-                    candidate_name = first_line.lstrip("#").strip().replace(" ", "_")
+            with open(optimized_resume_path, "r", encoding="utf-8") as f:
+                optimized_resume_md = f.read()
+            first_line = optimized_resume_md.partition("\n")[0]
+            if first_line.startswith("#"):
+                candidate_name = first_line.lstrip("#").strip().replace(" ", "_")
         except Exception:
             candidate_name = "candidate"
 
@@ -115,29 +139,37 @@ def process_resume(openai_api_key, serper_api_key, model_choice, new_resume, com
             new_output_dir = os.path.join("output", folder_name)
             os.makedirs(new_output_dir, exist_ok=True)
 
-            for filename in os.listdir("output"):
-                file_path = os.path.join("output", filename)
-                if file_path == new_output_dir:
-                    continue
-                if filename.endswith(".json") or filename.endswith(".md"):
-                    if os.path.isfile(file_path):
-                        shutil.move(file_path, os.path.join(new_output_dir, filename))
+            # DirEntry.is_file() comes from the directory listing, so this needs no stat call per entry
+            with os.scandir(run_dir) as it:
+                for entry in it:
+                    if (entry.name.endswith(".json") or entry.name.endswith(".md")) and entry.is_file():
+                        target_path = os.path.join(new_output_dir, entry.name)
+                        try:
+                            os.replace(entry.path, target_path)  # Same filesystem: atomic rename, no data copied
+                        except OSError:
+                            shutil.move(entry.path, target_path)
         except Exception as e:
             return (f"Error organizing output files: {str(e)}", None, None, None, None, None, None)
 
         # --- Convert Markdown to PDF ---
+        # Rendered in-process, one after another: the three documents take well under a
+        # second together, less than starting worker processes would cost, and documents
+        # already in the PDF cache are not rendered at all
+        md_filenames = ("optimized_resume.md", "final_report.md", "interview_questions.md")
+
+        preloaded_md = {"optimized_resume.md": optimized_resume_md}
+        # Only the resume always keeps its TOC; the report and questions drop it when short
+        toc_levels = {"optimized_resume.md": 2}
+
+        # A missing document is reported by convert_md_to_pdf itself (empty path)
         def md_to_pdf_in_dir(md_filename):
+            md_path = os.path.join(new_output_dir, md_filename)
             try:
-                md_path = os.path.join(new_output_dir, md_filename)
-                if os.path.isfile(md_path):
-                    return convert_md_to_pdf(md_path)
-                return ""
+                return convert_md_to_pdf(md_path, preloaded_md.get(md_filename), toc_levels.get(md_filename))
             except Exception as e:
                 return f"Error converting {md_filename} to PDF: {str(e)}"
 
-        pdf_opt = md_to_pdf_in_dir("optimized_resume.md")
-        pdf_final = md_to_pdf_in_dir("final_report.md")
-        pdf_int = md_to_pdf_in_dir("interview_questions.md")
+        pdf_opt, pdf_final, pdf_int = (md_to_pdf_in_dir(name) for name in md_filenames)
 
         message = f"Processing completed using model {model_choice}. Output saved in: {new_output_dir}"
 
@@ -145,14 +177,9 @@ def process_resume(openai_api_key, serper_api_key, model_choice, new_resume, com
 
     except Exception as e:
         return (f"Unexpected error: {str(e)}", None, None, None, None, None, None)
-
-# --- Define available models ---
-model_choices = {
-    "GPT-4o-mini": "gpt-4o-mini-2024-07-18",
-    "GPT-4o": "gpt-4o-2024-08-06",
-    "o3-mini": "o3-mini-2025-01-31",
-    "o1-mini": "o1-mini-2024-09-12"
-}
+    finally:
+        if run_dir is not None:
+            shutil.rmtree(run_dir, ignore_errors=True)
 
 with gr.Blocks(css=".output-column { width: 700px; }") as demo:
     with gr.Row():
@@ -174,7 +201,7 @@ with gr.Blocks(css=".output-column { width: 700px; }") as demo:
                 interactive=True,
                 info="Select the model to use for processing."
             )
-            new_resume_file = gr.File(label="Upload New Resume PDF", file_types=[".pdf"])
+            new_resume_file = gr.File(label="Upload New Resume PDF", file_types=[".pdf"], type="filepath")
             company_name_text = gr.Textbox(label="Company Name", placeholder="Enter company name")
             job_url_text = gr.Textbox(label="Job URL", placeholder="Enter job posting URL")
             run_button = gr.Button("Run")
@@ -213,5 +240,9 @@ with gr.Blocks(css=".output-column { width: 700px; }") as demo:
         ]
     )
 
+# Sync handlers run on Gradio's worker threads, so up to 8 users' runs (mostly waiting on
+# OpenAI/Serper) overlap instead of queueing behind each other
+demo.queue(default_concurrency_limit=8, max_size=32)
+
 if __name__ == "__main__":
     demo.launch()
@@ -0,0 +1,231 @@
+"""
+Helpers shared by the Gradio entry points: working directories, model choices,
+Markdown -> PDF conversion and the PDF / crew-output caches.
+
+Kept free of Gradio and CrewAI imports.
+"""
+import io
+import os
+import re
+import shutil
+import hashlib
+import tempfile
+import threading
+import time
+from typing import Optional
+
+# Set backend directories for Hugging Face Spaces
+UPLOAD_DIR = "/tmp/uploads"
+OUTPUT_DIR = "/tmp/output"
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+# Working directories used by ResumeCrew (relative to the app's working directory)
+os.makedirs("knowledge", exist_ok=True)
+os.makedirs("output", exist_ok=True)
+
+# Rendered PDFs keyed by a hash of their Markdown source, so unchanged documents skip MarkdownPdf
+PDF_CACHE_DIR = "/tmp/mdpdf_cache"
+PDF_CACHE_MAX_ENTRIES = 64
+os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+
+def _pdf_cache_key(md_content: str, toc_level: int) -> str:
+    """
+    Content-addressed cache key for a Markdown document rendered with the given TOC level.
+    """
+    digest = hashlib.blake2b(md_content.encode("utf-8"), digest_size=32)
+    digest.update(f"toc_level={toc_level}".encode("utf-8"))
+    return digest.hexdigest()
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """
+    Hardlink src to dst (no data copied), falling back to a file copy across filesystems.
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+def _write_bytes(path: str, data: memoryview) -> None:
+    """
+    Write data to path straight from the given buffer, bypassing Python's buffered file layer.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+    finally:
+        os.close(fd)
+
+def _store_in_pdf_cache(pdf_path: str, cached_path: str) -> None:
+    """
+    Publish a freshly rendered PDF into the cache and evict the least recently used entries.
+    """
+    # Handlers run on threads of one process, so the PID alone doesn't make the name unique
+    tmp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    _link_or_copy(pdf_path, tmp_path)
+    os.replace(tmp_path, cached_path)
+
+    with os.scandir(PDF_CACHE_DIR) as it:
+        entries = [entry for entry in it if entry.name.endswith(".pdf") and entry.is_file()]
+    entries.sort(key=lambda entry: entry.stat().st_atime, reverse=True)
+    for entry in entries[PDF_CACHE_MAX_ENTRIES:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+# markdown-pdf pulls in PyMuPDF; import it on first conversion rather than at app startup
+_markdown_pdf = None
+
+def _get_markdown_pdf():
+    """
+    Import markdown_pdf once, on first use, and return the module.
+    """
+    global _markdown_pdf
+    if _markdown_pdf is None:
+        import markdown_pdf
+        _markdown_pdf = markdown_pdf
+    return _markdown_pdf
+
+# Documents this small (or with this few headings) don't get a PDF table of contents
+SMALL_DOC_BYTES = 8 * 1024
+SMALL_DOC_HEADINGS = 3
+
+def _auto_toc_level(md_content: str) -> int:
+    """
+    TOC depth for a document: none for short documents, two levels otherwise.
+    """
+    if len(md_content.encode("utf-8")) < SMALL_DOC_BYTES:
+        return 0
+    if len(re.findall(r"^#+ ", md_content, re.M)) < SMALL_DOC_HEADINGS:
+        return 0
+    return 2
+
+def convert_md_to_pdf(md_path: str, md_content: Optional[str] = None, toc_level: Optional[int] = 2) -> str:
+    """
+    Convert a local .md file to .pdf using markdown-pdf.
+    Pass md_content when the file has already been read to avoid reading it again.
+    toc_level=None picks the TOC depth from the document size (see _auto_toc_level).
+    Identical Markdown is served from PDF_CACHE_DIR instead of being rendered again.
+    Returns the resulting PDF file path, or an empty string if conversion fails.
+    """
+    if md_content is None:
+        try:
+            with open(md_path, "r", encoding="utf-8") as f:
+                md_content = f.read()
+        except FileNotFoundError:
+            return ""
+
+    if toc_level is None:
+        toc_level = _auto_toc_level(md_content)
+    pdf_path = os.path.splitext(md_path)[0] + ".pdf"
+    cached_path = os.path.join(PDF_CACHE_DIR, _pdf_cache_key(md_content, toc_level) + ".pdf")
+    if os.path.isfile(cached_path):
+        os.utime(cached_path)  # Mark as recently used for eviction
+        _link_or_copy(cached_path, pdf_path)
+        return pdf_path
+
+    if os.path.lexists(pdf_path):
+        os.remove(pdf_path)  # May be a hardlink into the cache; never write through it
+    pdf_obj = _get_markdown_pdf().MarkdownPdf(toc_level=toc_level)  # Single-use: saving closes its writer
+    pdf_obj.add_section(_get_markdown_pdf().Section(md_content))
+    buf = io.BytesIO()
+    pdf_obj.save(buf)
+    with buf.getbuffer() as data:
+        _write_bytes(pdf_path, data)
+
+    try:
+        _store_in_pdf_cache(pdf_path, cached_path)
+    except OSError:
+        pass  # Caching is best-effort; the rendered PDF is already in place
+    return pdf_path
+
+# Crew outputs of earlier runs keyed by (resume, company, job URL, model), so repeat runs skip the crew
+OUTPUT_CACHE_DIR = "/tmp/output_cache"
+CACHED_OUTPUT_FILES = ("optimized_resume.md", "final_report.md", "interview_questions.md", "job_analysis.json")
+OUTPUT_CACHE_MAX_ENTRIES = 64
+OUTPUT_CACHE_TTL_SECONDS = 24 * 60 * 60
+_OUTPUT_CACHE_STAGING_PREFIX = ".staging-"
+_output_cache_lock = threading.Lock()  # Serializes publishing and eviction between handler threads
+os.makedirs(OUTPUT_CACHE_DIR, exist_ok=True)
+
+def output_cache_key(resume_path: str, company_name: str, job_url: str, model: str) -> str:
+    """
+    Hash of the resume bytes and the run parameters that determine the crew outputs.
+    """
+    digest = hashlib.sha256()
+    with open(resume_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    for value in (company_name, job_url, model):
+        digest.update(b"\0" + (value or "").encode("utf-8"))
+    return digest.hexdigest()
+
+def restore_cached_outputs(cache_dir: str, run_dir: str) -> bool:
+    """
+    Copy a cached run back into run_dir. Returns False unless every required file is cached
+    and the entry is younger than OUTPUT_CACHE_TTL_SECONDS.
+    """
+    if not all(os.path.isfile(os.path.join(cache_dir, name)) for name in CACHED_OUTPUT_FILES):
+        return False
+    if time.time() - os.path.getmtime(os.path.join(cache_dir, CACHED_OUTPUT_FILES[0])) >= OUTPUT_CACHE_TTL_SECONDS:
+        return False
+    os.utime(cache_dir)  # Mark as recently used for eviction
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.is_file():
+                shutil.copyfile(entry.path, os.path.join(run_dir, entry.name))
+    return True
+
+def store_outputs_in_cache(cache_dir: str, run_dir: str) -> None:
+    """
+    Copy the .json/.md files the crew just wrote to run_dir into the keyed cache directory,
+    then evict expired and least recently used entries.
+    """
+    # A private staging directory per call: concurrent runs share a PID but must never
+    # publish (or delete) each other's half-copied files
+    tmp_dir = tempfile.mkdtemp(prefix=_OUTPUT_CACHE_STAGING_PREFIX, dir=OUTPUT_CACHE_DIR)
+    try:
+        with os.scandir(run_dir) as it:
+            for entry in it:
+                if (entry.name.endswith(".json") or entry.name.endswith(".md")) and entry.is_file():
+                    shutil.copyfile(entry.path, os.path.join(tmp_dir, entry.name))
+        with _output_cache_lock:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            os.replace(tmp_dir, cache_dir)
+            _evict_cached_outputs()
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+def _evict_cached_outputs() -> None:
+    """
+    Remove output cache entries past their TTL and all but the OUTPUT_CACHE_MAX_ENTRIES most recently used.
+    """
+    now = time.time()
+    with os.scandir(OUTPUT_CACHE_DIR) as it:
+        entries = []
+        for entry in it:
+            if entry.is_dir() and not entry.name.startswith(_OUTPUT_CACHE_STAGING_PREFIX):
+                try:
+                    last_used = entry.stat().st_mtime  # Directory mtime, refreshed on every hit
+                    created = os.path.getmtime(os.path.join(entry.path, CACHED_OUTPUT_FILES[0]))
+                except OSError:
+                    last_used = created = 0  # Incomplete entry
+                entries.append((last_used, created, entry.path))
+    entries.sort(reverse=True)
+    for index, (_, created, path) in enumerate(entries):
+        if index >= OUTPUT_CACHE_MAX_ENTRIES or now - created >= OUTPUT_CACHE_TTL_SECONDS:
+            shutil.rmtree(path, ignore_errors=True)
+
+# --- Define available models ---
+model_choices = {
+    "GPT-4o-mini": "gpt-4o-mini-2024-07-18",
+    "GPT-4o": "gpt-4o-2024-08-06",
+    "o3-mini": "o3-mini-2025-01-31",
+    "o1-mini": "o1-mini-2024-09-12"
+}
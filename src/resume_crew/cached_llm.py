@@ -0,0 +1,202 @@
+import hashlib
+import importlib.util
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import litellm
+from crewai import LLM
+from litellm.exceptions import RateLimitError
+
+from .json_files import evict_json_cache, loads_json, store_json, touch_json
+from .rate_limit import key_fingerprint, request_budget, retry_on_rate_limit
+
+LLM_CACHE_DIR = "/tmp/llm_cache"
+LLM_CACHE_TTL_SECONDS = 60 * 60
+LLM_CACHE_MAX_ENTRIES = 2048
+
+# One keep-alive connection pool for every provider request in the process, instead of a
+# pool (and TLS handshake) per client litellm creates
+if litellm.client_session is None:
+    litellm.client_session = httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        http2=importlib.util.find_spec("h2") is not None  # httpx needs the optional h2 package for HTTP/2
+    )
+
+
+class CachedLLM(LLM):
+    """
+    LLM that answers repeated prompts from a local disk cache instead of the provider.
+
+    Only exact repeats are served: prompts embed the full resume and job posting, so
+    "similar" prompts differ precisely in the details that change the answer.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        cache_dir: str = LLM_CACHE_DIR,
+        cache_ttl: float = LLM_CACHE_TTL_SECONDS,
+        stream_to: Optional[str] = None,
+        **kwargs: Any
+    ) -> None:
+        """
+        stream_to, if given, is a file that plain completions are streamed into token by
+        token while they are generated, so long outputs can be previewed before the task
+        finishes (the task's output_file then replaces it with the final answer).
+        """
+        super().__init__(*args, **kwargs)
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.stream_to = stream_to
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def canonical_messages(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Normalize line endings and trailing whitespace so repeated prompts are byte-identical.
+        Both this cache and provider-side prefix caching (automatic on OpenAI for prompts of
+        1024+ tokens) only match identical bytes.
+        """
+        canonical = []
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, str):
+                content = "\n".join(line.rstrip() for line in content.replace("\r\n", "\n").split("\n")).rstrip()
+                message = {**message, "content": content}
+            canonical.append(message)
+        return canonical
+
+    def cache_marked_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Mark the agent's system prompt as a cacheable prefix for Anthropic models, which
+        (unlike OpenAI) only cache prompt prefixes that carry a cache_control marker.
+        """
+        if not (self.model.startswith("anthropic/") or "claude" in self.model):
+            return messages
+        marked = []
+        for message in messages:
+            if message.get("role") == "system" and isinstance(message.get("content"), str):
+                message = {
+                    **message,
+                    "content": [{"type": "text", "text": message["content"], "cache_control": {"type": "ephemeral"}}]
+                }
+            marked.append(message)
+        return marked
+
+    def fingerprint(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Stable identifier of a request: the model, its sampling temperature and the
+        full message list (system prompt included).
+        """
+        payload = json.dumps(
+            {"model": self.model, "temperature": self.temperature, "messages": messages},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def call(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        messages = self.canonical_messages(messages)
+
+        # Function calls execute tools, so only plain completions are cached
+        if tools or available_functions:
+            return self._call_provider(messages, tools, callbacks, available_functions)
+
+        fingerprint = self.fingerprint(messages)
+        cache_path = os.path.join(self.cache_dir, f"{fingerprint}.json")
+        try:
+            if time.time() - os.path.getmtime(cache_path) < self.cache_ttl:
+                with open(cache_path, "rb") as f:
+                    data = f.read()
+                entry = loads_json(data)
+                if entry.get("fingerprint") == fingerprint:
+                    touch_json(cache_path)
+                    return entry["response"]
+        except (OSError, ValueError, KeyError):
+            pass  # Missing, expired or unreadable entry: fall through to the provider
+
+        response = self._call_provider(messages, tools, callbacks, available_functions)
+        if isinstance(response, str) and response:
+            store_json(cache_path, {"fingerprint": fingerprint, "model": self.model, "response": response})
+            evict_json_cache(self.cache_dir, self.cache_ttl, LLM_CACHE_MAX_ENTRIES)
+        return response
+
+    @retry_on_rate_limit(lambda error: isinstance(error, RateLimitError))
+    def _call_provider(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[dict]],
+        callbacks: Optional[List[Any]],
+        available_functions: Optional[Dict[str, Any]],
+    ) -> str:
+        # Provider limits apply per API key, and every user brings their own
+        request_budget(f"openai:{key_fingerprint(self.api_key)}:{self.model}", "openai").acquire()
+        if self.stream_to and not (tools or available_functions):
+            return self._stream_completion(self.cache_marked_messages(messages), callbacks)
+        return super().call(self.cache_marked_messages(messages), tools, callbacks, available_functions)
+
+    def completion_params(self, messages: List[Dict[str, Any]], **overrides: Any) -> Dict[str, Any]:
+        """
+        litellm.completion arguments for messages: the same fields, in the same way, as
+        crewai's LLM.call sends them, with overrides applied and unset values dropped.
+        """
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "timeout": self.timeout,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "n": self.n,
+            "stop": self.stop,
+            "max_tokens": self.max_tokens or self.max_completion_tokens,
+            "presence_penalty": self.presence_penalty,
+            "frequency_penalty": self.frequency_penalty,
+            "logit_bias": self.logit_bias,
+            "response_format": self.response_format,
+            "seed": self.seed,
+            "logprobs": self.logprobs,
+            "top_logprobs": self.top_logprobs,
+            "api_base": self.base_url,
+            "api_version": self.api_version,
+            "api_key": self.api_key,
+            "stream": False,
+            **overrides,
+        }
+        return {k: v for k, v in params.items() if v is not None}
+
+    def _stream_completion(self, messages: List[Dict[str, Any]], callbacks: Optional[List[Any]]) -> str:
+        if callbacks:
+            self.set_callbacks(callbacks)
+        params = self.completion_params(messages, stream=True, stream_options={"include_usage": True})
+
+        deltas = []
+        usage = None
+        os.makedirs(os.path.dirname(self.stream_to) or ".", exist_ok=True)
+        with open(self.stream_to, "w", encoding="utf-8", buffering=1) as f:
+            for chunk in litellm.completion(**params):
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    f.write(delta)
+                    deltas.append(delta)
+                usage = getattr(chunk, "usage", None) or usage  # Sent with the final chunk
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Report token usage the way LLM.call does, so crew.usage_metrics counts streamed calls
+        if usage:
+            for callback in callbacks or []:
+                if hasattr(callback, "log_success_event"):
+                    callback.log_success_event(
+                        kwargs=params, response_obj={"usage": usage}, start_time=0, end_time=0
+                    )
+        return "".join(deltas)
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from typing import Any, List, Optional
+
+from crewai import Task
+from crewai.tasks.task_output import TaskOutput
+from pydantic import Field
+
+from .models import CompanyResearch
+
+COMPANY_RESEARCH_DB = "/tmp/company_research_cache.sqlite3"
+COMPANY_RESEARCH_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Legal-form suffixes dropped so "Google", "Google LLC" and "Google, Inc." share an entry
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co",
+    "company", "plc", "gmbh", "ag", "sa", "bv", "pvt", "llp", "group", "holdings"
+}
+
+
+def normalize_company_name(name: str) -> str:
+    words = re.sub(r"[^\w\s]", " ", name.casefold()).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(COMPANY_RESEARCH_DB), exist_ok=True)
+    connection = sqlite3.connect(COMPANY_RESEARCH_DB, timeout=10)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS company_research (key TEXT PRIMARY KEY, created REAL, research TEXT)"
+    )
+    return connection
+
+
+def cached_company_research(key: str) -> Optional[CompanyResearch]:
+    try:
+        with _connect() as connection:
+            row = connection.execute(
+                "SELECT research FROM company_research WHERE key = ? AND created > ?",
+                (key, time.time() - COMPANY_RESEARCH_TTL_SECONDS)
+            ).fetchone()
+        return CompanyResearch.model_validate_json(row[0]) if row else None
+    except (sqlite3.Error, ValueError):
+        return None  # Unreadable cache: research again
+
+
+def store_company_research(key: str, research: CompanyResearch) -> None:
+    try:
+        with _connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO company_research (key, created, research) VALUES (?, ?, ?)",
+                (key, time.time(), research.model_dump_json())
+            )
+    except sqlite3.Error:
+        pass  # Caching is best-effort
+
+
+class CachedCompanyResearchTask(Task):
+    """
+    Task that serves company research from a 7-day cache keyed by the normalized company
+    name, skipping both the Serper searches and the LLM calls on a hit.
+    """
+
+    company_name: Optional[str] = Field(default=None, description="Company the research is about")
+
+    def _cache_key(self) -> Optional[str]:
+        if not self.company_name or not normalize_company_name(self.company_name):
+            return None
+        return hashlib.sha256(normalize_company_name(self.company_name).encode("utf-8")).hexdigest()
+
+    def _execute_core(self, agent: Any, context: Optional[str], tools: Optional[List[Any]]) -> TaskOutput:
+        key = self._cache_key()
+        research = cached_company_research(key) if key else None
+        if research is None:
+            task_output = super()._execute_core(agent, context, tools)
+            if key and isinstance(task_output.pydantic, CompanyResearch):
+                store_company_research(key, task_output.pydantic)
+            return task_output
+
+        self.agent = agent or self.agent
+        raw = research.model_dump_json()
+        self.output = TaskOutput(
+            name=self.name,
+            description=self.description,
+            expected_output=self.expected_output,
+            raw=raw,
+            pydantic=research,
+            agent=self.agent.role,
+            output_format=self._get_output_format()
+        )
+        if self.callback:
+            self.callback(self.output)
+        if self.output_file:
+            self._save_file(raw)
+        return self.output
@@ -1,7 +1,21 @@
-from crewai import Agent, Crew, Process, Task, LLM
-from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import SerperDevTool, ScrapeWebsiteTool
-from crewai.knowledge.source.pdf_knowledge_source import PDFKnowledgeSource
+import asyncio
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import yaml
+from crewai import Agent, Crew, Process, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.knowledge.knowledge import Knowledge
+from crewai.project import CrewBase, agent, before_kickoff, crew, task
+from .cached_llm import CachedLLM, LLM_CACHE_TTL_SECONDS
+from .company_research_cache import CachedCompanyResearchTask
+from .knowledge_source import CachedPDFKnowledgeSource
+from .tools.scrape_tool import AsyncScrapeWebsiteTool
+from .tools.serper_tool import CachedSerperDevTool
 from .models import (
     JobRequirements,
     ResumeOptimization,
@@ -9,6 +23,34 @@ from .models import (
     InterviewQuestions
 )
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _parsed_yaml(config_path: str) -> Dict[str, Any]:
+    with open(config_path, "r", encoding="utf-8") as file:
+        return yaml.safe_load(file)
+
+
+def load_yaml_once(config_path: Path) -> Dict[str, Any]:
+    """
+    Agent/task config parsed once per process. CrewBase fills the returned dicts in place
+    with Agent and Task objects, so each crew gets its own copy.
+    """
+    return copy.deepcopy(_parsed_yaml(str(config_path)))
+
+
+# Tools hold no per-crew state, so every crew in the process shares the same instances
+@lru_cache(maxsize=8)
+def _get_serper(api_key: str) -> CachedSerperDevTool:
+    return CachedSerperDevTool(api_key=api_key)
+
+
+@lru_cache(maxsize=1)
+def _get_scraper() -> AsyncScrapeWebsiteTool:
+    return AsyncScrapeWebsiteTool()
+
+
 @CrewBase
 class ResumeCrew():
     """ResumeCrew for resume optimization and interview preparation"""
@@ -16,126 +58,297 @@ class ResumeCrew():
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
-    def __init__(self, model: str, openai_api_key: str, serper_api_key: str, resume_pdf_path: str) -> None:
+    # Keys of a kickoff_batch run that are crew inputs rather than constructor arguments
+    KICKOFF_INPUTS = ('job_url', 'company_name')
+
+    # (model, temperature) pairs raced by kickoff_speculative; o-series models only accept
+    # their default temperature
+    SPECULATIVE_VARIANTS = (('o3-mini-2025-01-31', None), ('gpt-4o-2024-08-06', 0.4))
+
+    def __init__(
+        self,
+        model: str,
+        openai_api_key: str,
+        serper_api_key: str,
+        resume_pdf_path: str,
+        output_dir: str = "output",
+        pipeline: Optional[Sequence[str]] = None,
+        model_base: str = "gpt-4o-mini-2024-07-18",
+        verbose: bool = True,
+        temperature: Optional[float] = None
+    ) -> None:
         """
         Initialize ResumeCrew with the selected model and user-provided API keys.
+        Task outputs are written to output_dir (a relative path).
+        pipeline names the tasks whose outputs are wanted (e.g. ["generate_interview_questions_md_task"]);
+        the crew then runs only those and the tasks they take context from. None runs everything.
+        The selected model drives the reasoning-heavy agents (resume and job analysis, interview
+        questions); research, writing and report formatting run on the cheaper model_base.
+        verbose=False silences the agents' and crew's step-by-step console output.
+        temperature, if given, overrides the sampling temperature of every agent's model.
         """
-        self.model = model  
+        self.model_advanced = model
+        self.model_base = model_base
         self.openai_api_key = openai_api_key  # Store user-provided OpenAI API Key
         self.serper_api_key = serper_api_key  # Store user-provided Serper API Key
-        self.resume_pdf = PDFKnowledgeSource(file_paths=[resume_pdf_path])  # Use user-uploaded resume
+        # Embed the resume with this crew's own key rather than OPENAI_API_KEY from the environment
+        self.embedder = {"provider": "openai", "config": {"api_key": openai_api_key, "model": "text-embedding-3-small"}}
+        self.resume_pdf = CachedPDFKnowledgeSource(file_paths=[resume_pdf_path])  # Use user-uploaded resume; crew-level, so every agent can query it
+        self.output_dir = output_dir
+        self.pipeline = pipeline
+        self.verbose = verbose
+        self.temperature = temperature
+        self._llm_cache: Dict[Tuple[Any, ...], CachedLLM] = {}
+
+    def _llm(self, model: str, **options: Any) -> CachedLLM:
+        """
+        Shared LLM for a model and set of options, so agents configured alike reuse one client.
+        """
+        if self.temperature is not None:
+            options.setdefault('temperature', self.temperature)
+        key = (model, self.openai_api_key, *sorted(options.items()))
+        if key not in self._llm_cache:
+            self._llm_cache[key] = CachedLLM(model, api_key=self.openai_api_key, **options)
+        return self._llm_cache[key]
 
     @agent
     def resume_analyzer(self) -> Agent:
         return Agent(
             config=self.agents_config['resume_analyzer'],
-            verbose=True,
-            llm=LLM(self.model, api_key=self.openai_api_key),  # Use user-provided OpenAI API Key
-            knowledge_sources=[self.resume_pdf]
+            verbose=self.verbose,
+            llm=self._llm(self.model_advanced)  # Use user-provided OpenAI API Key
         )
     
     @agent
     def job_analyzer(self) -> Agent:
         return Agent(
             config=self.agents_config['job_analyzer'],
-            verbose=True,
-            tools=[ScrapeWebsiteTool()],
-            llm=LLM(self.model, api_key=self.openai_api_key)  # Use dynamic API key
+            verbose=self.verbose,
+            tools=[_get_scraper()],
+            llm=self._llm(self.model_advanced)  # Use dynamic API key
         )
 
     @agent
     def company_researcher(self) -> Agent:
         return Agent(
             config=self.agents_config['company_researcher'],
-            verbose=True,
-            tools=[SerperDevTool(api_key=self.serper_api_key)],  # Use user-provided Serper API Key
-            llm=LLM(self.model, api_key=self.openai_api_key),  # Use dynamic API key
-            knowledge_sources=[self.resume_pdf]
+            verbose=self.verbose,
+            tools=[_get_serper(self.serper_api_key)],  # Use user-provided Serper API Key
+            llm=self._llm(self.model_base, cache_ttl=24 * LLM_CACHE_TTL_SECONDS)  # Company facts change slowly
         )
 
     @agent
     def resume_writer(self) -> Agent:
         return Agent(
             config=self.agents_config['resume_writer'],
-            verbose=True,
-            llm=LLM(self.model, api_key=self.openai_api_key)
+            verbose=self.verbose,
+            llm=self._llm(self.model_base, stream_to=f'{self.output_dir}/optimized_resume.md')  # Preview while generating
         )
 
     @agent
     def report_generator(self) -> Agent:
         return Agent(
             config=self.agents_config['report_generator'],
-            verbose=True,
-            llm=LLM(self.model, api_key=self.openai_api_key)
+            verbose=self.verbose,
+            llm=self._llm(self.model_base, stream_to=f'{self.output_dir}/final_report.md')  # Preview while generating
         )
     
     @agent
     def interview_question_generator(self) -> Agent:
         return Agent(
             config=self.agents_config['interview_question_generator'],
-            verbose=True,
-            llm=LLM(self.model, api_key=self.openai_api_key)
+            verbose=self.verbose,
+            llm=self._llm(self.model_advanced)
         )
 
+    # Task methods run in definition order, in three phases:
+    #   1. job analysis and company research (independent, run asynchronously)
+    #   2. optimize_resume_task, once both have finished
+    #   3. resume, report and interview questions (each only reads phases 1-2 and
+    #      uses its own agent, so they run asynchronously), joined by the final
+    #      interview questions markdown task
     @task
     def analyze_job_task(self) -> Task:
         return Task(
             config=self.tasks_config['analyze_job_task'],
-            output_file='output/job_analysis.json',
-            output_pydantic=JobRequirements
+            output_file=f'{self.output_dir}/job_analysis.json',
+            output_pydantic=JobRequirements,
+            async_execution=True
         )
 
     @task
-    def optimize_resume_task(self) -> Task:
-        return Task(
-            config=self.tasks_config['optimize_resume_task'],
-            output_file='output/resume_optimization.json',
-            output_pydantic=ResumeOptimization
+    def research_company_task(self) -> Task:
+        return CachedCompanyResearchTask(  # Company name is set before kickoff
+            config=self.tasks_config['research_company_task'],
+            output_file=f'{self.output_dir}/company_research.json',
+            output_pydantic=CompanyResearch,
+            async_execution=True
         )
 
     @task
-    def research_company_task(self) -> Task:
+    def optimize_resume_task(self) -> Task:
         return Task(
-            config=self.tasks_config['research_company_task'],
-            output_file='output/company_research.json',  
-            output_pydantic=CompanyResearch
+            config=self.tasks_config['optimize_resume_task'],
+            output_file=f'{self.output_dir}/resume_optimization.json',
+            output_pydantic=ResumeOptimization
         )
 
     @task
     def generate_resume_task(self) -> Task:
         return Task(
             config=self.tasks_config['generate_resume_task'],
-            output_file='output/optimized_resume.md'
+            output_file=f'{self.output_dir}/optimized_resume.md',
+            async_execution=True
         )
 
     @task
     def generate_report_task(self) -> Task:
         return Task(
             config=self.tasks_config['generate_report_task'],
-            output_file='output/final_report.md'
+            output_file=f'{self.output_dir}/final_report.md',
+            async_execution=True
         )
 
     @task
     def generate_interview_questions_task(self) -> Task:
         return Task(
             config=self.tasks_config['generate_interview_questions_task'],
-            output_file='output/interview_questions.json',
-            output_pydantic=InterviewQuestions
+            output_file=f'{self.output_dir}/interview_questions.json',
+            output_pydantic=InterviewQuestions,
+            async_execution=True
         )
 
     @task
     def generate_interview_questions_md_task(self) -> Task:
         return Task(
             config=self.tasks_config['generate_interview_questions_md_task'],
-            output_file='output/interview_questions.md'
+            output_file=f'{self.output_dir}/interview_questions.md'
         )
 
+    def _pipeline_tasks(self) -> List[Task]:
+        """
+        Tasks needed for self.pipeline (plus their context, transitively), in execution order.
+        """
+        if self.pipeline is None:
+            return self.tasks
+
+        needed = set()
+        pending = [getattr(self, name)() for name in self.pipeline]
+        while pending:
+            task_instance = pending.pop()
+            if id(task_instance) not in needed:
+                needed.add(id(task_instance))
+                pending.extend(task_instance.context or [])
+        tasks = [task_instance for task_instance in self.tasks if id(task_instance) in needed]
+
+        # A crew may end with at most one async task; the last one gains nothing from being async
+        if tasks and tasks[-1].async_execution:
+            tasks[-1].async_execution = False
+        return tasks
+
+    @before_kickoff
+    def set_research_company(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        self.research_company_task().company_name = inputs.get('company_name')
+        return inputs
+
     @crew
     def crew(self) -> Crew:
-        return Crew(
-            agents=self.agents,
-            tasks=self.tasks,
-            verbose=True,
+        tasks = self._pipeline_tasks()
+        crew_instance = Crew(
+            agents=[
+                agent_instance for agent_instance in self.agents
+                if any(task_instance.agent is agent_instance for task_instance in tasks)
+            ],
+            tasks=tasks,
+            verbose=self.verbose,
             process=Process.sequential,
-            knowledge_sources=[self.resume_pdf]
+            embedder=self.embedder
+        )
+        # Crew(knowledge_sources=...) stores every crew's knowledge in one persistent "crew"
+        # collection, where a query can return another candidate's resume. Keep this resume
+        # in a collection of its own instead. No fallback on failure: without the resume the
+        # crew's output would be meaningless.
+        crew_instance._knowledge = Knowledge(
+            collection_name=self.resume_pdf.resume_collection_name(),
+            sources=[self.resume_pdf],
+            embedder_config=self.embedder
         )
+        return crew_instance
+
+    @classmethod
+    async def kickoff_batch(cls, runs: List[Dict[str, Any]], concurrency: int = 20) -> List[CrewOutput]:
+        """
+        Run one crew per entry of runs, at most `concurrency` at a time, and return their
+        outputs in input order. Each entry holds the constructor arguments plus the kickoff
+        inputs (job_url, company_name). Runs without an output_dir get output/batch_<index>
+        so they don't overwrite each other's files, and run quietly unless verbose is given.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+
+        # Crews block on LLM calls; give each concurrent run its own thread instead of
+        # sharing asyncio's small default executor (which kickoff_async uses)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            async def run_one(index: int, run: Dict[str, Any]) -> CrewOutput:
+                crew_kwargs = {key: value for key, value in run.items() if key not in cls.KICKOFF_INPUTS}
+                crew_kwargs.setdefault('output_dir', f'output/batch_{index}')
+                crew_kwargs.setdefault('verbose', False)  # Concurrent console output is unreadable and contends on stdout
+                inputs = {key: run[key] for key in cls.KICKOFF_INPUTS if key in run}
+                async with semaphore:
+                    return await loop.run_in_executor(
+                        executor, lambda: cls(**crew_kwargs).crew().kickoff(inputs=inputs)
+                    )
+
+            return await asyncio.gather(*(run_one(index, run) for index, run in enumerate(runs)))
+
+    @classmethod
+    async def kickoff_speculative(
+        cls,
+        inputs: Dict[str, Any],
+        variants: Sequence[Tuple[str, Optional[float]]] = SPECULATIVE_VARIANTS,
+        output_dir: str = 'output',
+        **crew_kwargs: Any
+    ) -> Tuple[CrewOutput, str]:
+        """
+        Race one crew per (model, temperature) variant and return the first output that
+        includes a valid ResumeOptimization, with the directory holding that crew's files
+        (output_dir/variant_<index>). crew_kwargs are the remaining constructor arguments.
+        Crews still running are abandoned, not stopped: crewai has no way to interrupt a
+        kickoff, so they finish in the background and their results are discarded.
+        """
+        def run_variant(model: str, temperature: Optional[float], variant_dir: str) -> CrewOutput:
+            return cls(
+                model=model, temperature=temperature, output_dir=variant_dir, **crew_kwargs
+            ).crew().kickoff(inputs=inputs)
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=len(variants))
+        variant_dirs = {}
+        for index, (model, temperature) in enumerate(variants):
+            variant_dir = f'{output_dir}/variant_{index}'
+            future = loop.run_in_executor(executor, run_variant, model, temperature, variant_dir)
+            variant_dirs[future] = variant_dir
+
+        pending = set(variant_dirs)
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        last_error = future.exception()
+                        logger.warning("Speculative crew in %s failed: %s", variant_dirs[future], last_error)
+                        continue
+                    output = future.result()
+                    if any(isinstance(task_output.pydantic, ResumeOptimization) for task_output in output.tasks_output):
+                        return output, variant_dirs[future]
+                    logger.warning("Speculative crew in %s produced no valid resume optimization", variant_dirs[future])
+            raise RuntimeError("No speculative crew produced a valid resume optimization") from last_error
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+# CrewBase re-reads both YAML files on every ResumeCrew(); parse them once instead
+ResumeCrew.load_yaml = staticmethod(load_yaml_once)
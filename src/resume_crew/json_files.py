@@ -0,0 +1,71 @@
+import json
+import os
+import threading
+import time
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+
+def loads_json(data: bytes) -> Any:
+    """
+    Parse JSON bytes, with orjson when it is installed.
+    """
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def store_json(path: str, value: Any) -> None:
+    """
+    Best-effort atomic write of a JSON cache entry: readers see the old file or the complete
+    new one, never a partial write. The temporary name is unique per process and thread.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Caching is best-effort
+
+
+def touch_json(path: str) -> None:
+    """
+    Mark a cache entry as used: the access time orders eviction, the modification time
+    (its creation) still drives the TTL.
+    """
+    try:
+        os.utime(path, (time.time(), os.path.getmtime(path)))
+    except OSError:
+        pass
+
+
+def evict_json_cache(cache_dir: str, ttl_seconds: float, max_entries: int) -> None:
+    """
+    Remove JSON cache entries past their TTL and all but the max_entries most recently used.
+    """
+    now = time.time()
+    try:
+        with os.scandir(cache_dir) as it:
+            entries = []
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue  # Removed by a concurrent sweep
+                    # Expired entries go first so they don't hold a place among the most recent
+                    expired = now - stat.st_mtime >= ttl_seconds
+                    entries.append((not expired, stat.st_atime, entry.path))
+    except OSError:
+        return
+    entries.sort(reverse=True)
+    for index, (fresh, _, path) in enumerate(entries):
+        if index >= max_entries or not fresh:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,95 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict
+
+from crewai.knowledge.source.pdf_knowledge_source import PDFKnowledgeSource
+
+# Extracted text of recently seen PDFs, keyed by SHA-256 of the file contents
+PDF_TEXT_CACHE_SIZE = 32
+_pdf_texts: "OrderedDict[str, str]" = OrderedDict()
+_pdf_texts_lock = threading.Lock()
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _extract_pdf_text(path: Path) -> str:
+    import pdfplumber
+
+    text = ""
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return text
+
+
+def pdf_text(path: Path) -> str:
+    """
+    Text of a PDF, cached by content so every upload of the same resume is parsed once per process.
+    """
+    digest = _file_digest(path)
+    with _pdf_texts_lock:
+        if digest in _pdf_texts:
+            _pdf_texts.move_to_end(digest)
+            return _pdf_texts[digest]
+
+    text = _extract_pdf_text(path)
+    with _pdf_texts_lock:
+        _pdf_texts[digest] = text
+        while len(_pdf_texts) > PDF_TEXT_CACHE_SIZE:
+            _pdf_texts.popitem(last=False)
+    return text
+
+
+class CachedPDFKnowledgeSource(PDFKnowledgeSource):
+    """
+    PDFKnowledgeSource that parses each distinct PDF once per process and only embeds
+    chunks that are not already stored in the target knowledge collection.
+    """
+
+    def resume_collection_name(self) -> str:
+        """
+        Knowledge collection for exactly these files, named after their contents, so crews
+        over different resumes never retrieve each other's chunks. (Not `collection_name`:
+        that is a pydantic field of BaseKnowledgeSource.)
+        """
+        digest = hashlib.sha256()
+        for path in self.safe_file_paths:
+            digest.update(_file_digest(self.convert_to_path(path)).encode("ascii"))
+        return f"resume_{digest.hexdigest()[:32]}"  # Chroma names are limited to 63 characters
+
+    def load_content(self) -> Dict[Path, str]:
+        content = {}
+        for path in self.safe_file_paths:
+            path = self.convert_to_path(path)
+            content[path] = pdf_text(path)
+        return content
+
+    def add(self) -> None:
+        # Chunk only the first time, should the source be added again
+        if not self.chunks:
+            for text in self.content.values():
+                self.chunks.extend(self._chunk_text(text))
+        self._save_documents()
+
+    def _save_documents(self) -> None:
+        collection = self.storage.collection if self.storage else None
+        if collection is None:
+            return super()._save_documents()
+
+        # KnowledgeStorage uses a chunk's SHA-256 as its ID; skip chunks the (persistent)
+        # collection already holds instead of paying to embed them again
+        ids = [hashlib.sha256(chunk.encode("utf-8")).hexdigest() for chunk in self.chunks]
+        existing = set(collection.get(ids=ids, include=[])["ids"]) if ids else set()
+        new_chunks = [chunk for chunk, chunk_id in zip(self.chunks, ids) if chunk_id not in existing]
+        if new_chunks:
+            self.storage.save(new_chunks)  # One upsert, embedded in one batched request
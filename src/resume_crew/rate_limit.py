@@ -0,0 +1,73 @@
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+# Requests per minute allowed per provider, per process (OpenAI tier-1 and Serper defaults)
+RPM_LIMITS: Dict[str, int] = {
+    "openai": 60,
+    "serper": 60,
+}
+
+
+class RequestBudget:
+    """Thread-safe token bucket that refills at `rpm` requests per minute."""
+
+    def __init__(self, rpm: int) -> None:
+        self.capacity = float(rpm)
+        self.tokens = float(rpm)
+        self.refill_per_second = rpm / 60.0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent, instead of bursting and getting HTTP 429.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.refill_per_second
+            time.sleep(wait)
+
+
+_budgets: Dict[str, RequestBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def key_fingerprint(api_key: Optional[str]) -> str:
+    """
+    Short, non-reversible identifier of an API key, for keying per-key state without storing the key.
+    """
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+def request_budget(key: str, provider: str) -> RequestBudget:
+    """
+    Shared budget for `key` (an API key fingerprint, plus the model ID where limits are per
+    model), sized from the provider's RPM limit.
+    """
+    with _budgets_lock:
+        budget = _budgets.get(key)
+        if budget is None:
+            budget = _budgets[key] = RequestBudget(RPM_LIMITS[provider])
+        return budget
+
+
+def retry_on_rate_limit(is_rate_limit: Callable[[BaseException], bool]):
+    """
+    Retry a provider call with exponential backoff (up to 30s, 5 attempts) while it is rate limited.
+    """
+    return retry(
+        retry=retry_if_exception(is_rate_limit),
+        wait=wait_exponential(multiplier=1, max=30),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
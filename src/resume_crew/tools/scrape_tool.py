@@ -0,0 +1,78 @@
+import asyncio
+import re
+from typing import Any, List, Type
+
+import aiohttp
+from bs4 import BeautifulSoup
+from crewai_tools import ScrapeWebsiteTool
+from pydantic import BaseModel, Field
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+SCRAPE_TIMEOUT_SECONDS = 5
+SCRAPE_MAX_CONNECTIONS = 20
+
+
+def _is_bad_gateway(error: BaseException) -> bool:
+    return isinstance(error, aiohttp.ClientResponseError) and error.status == 502
+
+
+def _page_text(html: str) -> str:
+    text = BeautifulSoup(html, "html.parser").get_text(" ")
+    text = re.sub("[ \t]+", " ", text)
+    return re.sub("\\s+\n\\s+", "\n", text)
+
+
+class AsyncScrapeWebsiteToolSchema(BaseModel):
+    """Input for AsyncScrapeWebsiteTool."""
+
+    website_url: str = Field(
+        ...,
+        description="URL of the website to read. To read several pages at once, pass all their "
+                    "URLs in this one field, separated by spaces or commas"
+    )
+
+
+class AsyncScrapeWebsiteTool(ScrapeWebsiteTool):
+    """
+    ScrapeWebsiteTool that accepts several URLs at once (separated by whitespace or commas)
+    and fetches them concurrently, with a 5s timeout per URL and backoff on HTTP 502.
+    """
+
+    name: str = "Read website content"
+    description: str = (
+        "A tool that can be used to read the content of one or more websites. Several URLs, "
+        "separated by spaces or commas, are fetched in parallel in a single call, so pass all "
+        "the pages you need (e.g. a job posting and its linked pages) together."
+    )
+    args_schema: Type[BaseModel] = AsyncScrapeWebsiteToolSchema
+
+    def _run(self, **kwargs: Any) -> Any:
+        website_url = kwargs.get("website_url", self.website_url) or ""
+        urls = [url for url in re.split(r"[\s,]+", website_url) if url]
+        pages = asyncio.run(self._fetch_all(urls))
+        if len(pages) == 1:
+            return pages[0]
+        return "\n\n".join(f"Content of {url}:\n{page}" for url, page in zip(urls, pages))
+
+    async def _fetch_all(self, urls: List[str]) -> List[str]:
+        connector = aiohttp.TCPConnector(limit=SCRAPE_MAX_CONNECTIONS)
+        timeout = aiohttp.ClientTimeout(total=SCRAPE_TIMEOUT_SECONDS)
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers=self.headers, cookies=self.cookies or {}
+        ) as session:
+            results = await asyncio.gather(*(self._fetch(session, url) for url in urls), return_exceptions=True)
+        # One unreachable page shouldn't cost the agent the others
+        return [
+            f"Error reading {url}: {result}" if isinstance(result, Exception) else result
+            for url, result in zip(urls, results)
+        ]
+
+    @retry(
+        retry=retry_if_exception(_is_bad_gateway),
+        wait=wait_exponential(multiplier=0.5, max=4),
+        stop=stop_after_attempt(3),
+        reraise=True
+    )
+    async def _fetch(self, session: aiohttp.ClientSession, url: str) -> str:
+        async with session.get(url, raise_for_status=True) as response:
+            return _page_text(await response.text(errors="replace"))
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+import requests
+from crewai_tools import SerperDevTool
+from pydantic import Field
+from requests.adapters import HTTPAdapter
+
+from ..json_files import evict_json_cache, loads_json, store_json, touch_json
+from ..rate_limit import key_fingerprint, request_budget, retry_on_rate_limit
+
+SERPER_CACHE_DIR = "/tmp/serper_cache"
+SERPER_CACHE_TTL_SECONDS = 24 * 60 * 60
+SERPER_CACHE_MAX_ENTRIES = 2048
+
+# Keep-alive connections to serper.dev shared by every tool instance and crew in the process
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+
+def _is_serper_rate_limit(error: BaseException) -> bool:
+    response = getattr(error, "response", None)
+    return isinstance(error, requests.HTTPError) and response is not None and response.status_code == 429
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """
+    SerperDevTool that answers repeated searches from a 24h disk cache, stays within
+    the Serper request budget, backs off on HTTP 429 and reuses pooled connections.
+    """
+
+    api_key: Optional[str] = Field(
+        default=None, description="Serper API key; falls back to the SERPER_API_KEY environment variable"
+    )
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        key = json.dumps([search_type, search_query, self.n_results], ensure_ascii=False)
+        cache_path = os.path.join(SERPER_CACHE_DIR, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+        try:
+            if time.time() - os.path.getmtime(cache_path) < SERPER_CACHE_TTL_SECONDS:
+                with open(cache_path, "rb") as f:
+                    data = f.read()
+                results = loads_json(data)
+                touch_json(cache_path)
+                return results
+        except (OSError, ValueError):
+            pass  # Missing, expired or unreadable entry: query Serper
+
+        results = self._request(search_query, search_type)
+        store_json(cache_path, results)
+        evict_json_cache(SERPER_CACHE_DIR, SERPER_CACHE_TTL_SECONDS, SERPER_CACHE_MAX_ENTRIES)
+        return results
+
+    @retry_on_rate_limit(_is_serper_rate_limit)
+    def _request(self, search_query: str, search_type: str) -> dict:
+        api_key = self.api_key or os.environ["SERPER_API_KEY"]
+        request_budget(f"serper:{key_fingerprint(api_key)}", "serper").acquire()  # Limits are per API key
+        # Same request as SerperDevTool._make_api_request, over the shared session
+        response = _session.post(
+            self._get_search_url(search_type),
+            headers={"X-API-KEY": api_key, "content-type": "application/json"},
+            json={"q": search_query, "num": self.n_results},
+            timeout=10
+        )
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            raise ValueError("Empty response from Serper API")
+        return results
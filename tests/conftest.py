@@ -0,0 +1,63 @@
+import hashlib
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPO_ROOT / "src"))
+
+SAMPLE_RESUME = "CV_Mohan.pdf"
+
+
+class HashingEmbeddingFunction(EmbeddingFunction):
+    """Offline bag-of-words embedder, so crews can be built without calling OpenAI."""
+
+    def __call__(self, input: Documents) -> Embeddings:
+        vectors = []
+        for document in input:
+            vector = [0.0] * 64
+            for word in document.lower().split():
+                vector[hashlib.sha256(word.encode("utf-8")).digest()[0] % 64] += 1.0
+            vectors.append(vector)
+        return vectors
+
+
+@pytest.fixture
+def crew_workdir(tmp_path, monkeypatch):
+    """
+    Working directory laid out like the app's (knowledge/ with the sample resume), with
+    CrewAI's persistent storage redirected to a throwaway project name.
+    """
+    (tmp_path / "knowledge").mkdir()
+    shutil.copyfile(REPO_ROOT / "knowledge" / SAMPLE_RESUME, tmp_path / "knowledge" / SAMPLE_RESUME)
+    monkeypatch.chdir(tmp_path)
+    storage_name = f"resume_crew_tests_{os.getpid()}_{tmp_path.name}"
+    monkeypatch.setenv("CREWAI_STORAGE_DIR", storage_name)
+    yield tmp_path
+
+    from crewai.utilities.paths import db_storage_path
+    shutil.rmtree(db_storage_path(), ignore_errors=True)
+
+
+@pytest.fixture
+def build_resume_crew(crew_workdir):
+    def build(**kwargs):
+        from resume_crew.crew import ResumeCrew
+
+        resume_crew = ResumeCrew(
+            model="gpt-4o-mini-2024-07-18",
+            openai_api_key="sk-test",
+            serper_api_key="serper-test",
+            resume_pdf_path=SAMPLE_RESUME,
+            output_dir="output/test_run",
+            verbose=False,
+            **kwargs
+        )
+        resume_crew.embedder = {"provider": HashingEmbeddingFunction()}
+        return resume_crew
+
+    return build
@@ -0,0 +1,40 @@
+def test_crew_has_resume_knowledge(build_resume_crew):
+    crew = build_resume_crew().crew()
+
+    assert crew._knowledge is not None
+    assert crew._knowledge.storage.collection.count() > 0
+
+
+def test_agents_reach_resume_through_crew_knowledge(build_resume_crew):
+    resume_crew = build_resume_crew()
+    crew = resume_crew.crew()
+
+    # Agents carry no knowledge of their own; the crew-level collection is their only source
+    assert all(agent._knowledge is None for agent in crew.agents)
+    resume_text = "".join(resume_crew.resume_pdf.content.values())
+    snippets = crew.query_knowledge(["work experience, skills and education"])
+    assert snippets
+    assert all(snippet["context"] in resume_text for snippet in snippets)
+
+
+def test_pipeline_runs_only_the_tasks_it_needs(build_resume_crew):
+    resume_crew = build_resume_crew(pipeline=["generate_interview_questions_md_task"])
+    crew = resume_crew.crew()
+
+    expected = [
+        "analyze_job_task", "research_company_task", "optimize_resume_task", "generate_interview_questions_md_task"
+    ]
+    assert len(crew.tasks) == len(expected)
+    assert all(task is getattr(resume_crew, name)() for task, name in zip(crew.tasks, expected))
+    assert not crew.tasks[-1].async_execution
+
+
+def test_pipeline_makes_its_last_task_synchronous(build_resume_crew):
+    resume_crew = build_resume_crew(pipeline=["generate_report_task"])
+    crew = resume_crew.crew()
+
+    assert crew.tasks[-1] is resume_crew.generate_report_task()
+    assert not crew.tasks[-1].async_execution
+
+    # Without a pipeline the report runs alongside the other generation tasks
+    assert build_resume_crew().generate_report_task().async_execution
@@ -0,0 +1,18 @@
+import os
+import time
+
+from resume_crew.json_files import evict_json_cache, loads_json, store_json, touch_json
+
+
+def test_eviction_drops_expired_and_least_recently_used(tmp_path):
+    now = time.time()
+    for index, name in enumerate(["expired", "old", "used", "new"]):
+        store_json(str(tmp_path / f"{name}.json"), {"name": name})
+        os.utime(tmp_path / f"{name}.json", (now - 100 + index, now - 100 + index))
+    os.utime(tmp_path / "expired.json", (now, now - 7200))
+    touch_json(str(tmp_path / "used.json"))
+
+    evict_json_cache(str(tmp_path), ttl_seconds=3600, max_entries=2)
+
+    assert sorted(os.listdir(tmp_path)) == ["new.json", "used.json"]
+    assert loads_json((tmp_path / "used.json").read_bytes()) == {"name": "used"}
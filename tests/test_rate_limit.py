@@ -0,0 +1,10 @@
+from resume_crew.rate_limit import key_fingerprint, request_budget
+
+
+def test_budgets_are_per_api_key():
+    first = request_budget(f"openai:{key_fingerprint('sk-first')}:gpt-4o", "openai")
+    second = request_budget(f"openai:{key_fingerprint('sk-second')}:gpt-4o", "openai")
+
+    assert first is not second
+    assert first is request_budget(f"openai:{key_fingerprint('sk-first')}:gpt-4o", "openai")
+    assert "sk-first" not in key_fingerprint("sk-first")